@@ -9,6 +9,87 @@ app.use(cors());
 
 console.log('Starting License Plate OCR Backend...');
 
+// One long-lived Python worker (process_frame.py --worker) so EasyOCR is
+// loaded once instead of per frame. Each request is a 4-byte big-endian frame
+// count followed by length-prefixed frames; each reply is a length-prefixed
+// JSON list with one result per frame. Replies come back in order.
+const PROCESS_TIMEOUT_MS = 60000;
+let worker = null;
+
+function startWorker() {
+  const proc = spawn('python3', [path.join(__dirname, 'process_frame.py'), '--worker']);
+  proc.pending = [];
+  let stdoutBuf = Buffer.alloc(0);
+
+  proc.stdout.on('data', (data) => {
+    stdoutBuf = Buffer.concat([stdoutBuf, data]);
+    while (stdoutBuf.length >= 4) {
+      const n = stdoutBuf.readUInt32BE(0);
+      if (stdoutBuf.length < 4 + n) break;
+      const message = stdoutBuf.subarray(4, 4 + n).toString();
+      stdoutBuf = stdoutBuf.subarray(4 + n);
+      const job = proc.pending.shift();
+      if (job) job.resolve(message);
+    }
+  });
+
+  proc.stderr.on('data', (data) => {
+    console.error('Python error:', data.toString());
+  });
+
+  // e.g. python3 missing (ENOENT); must not crash the server
+  proc.on('error', (err) => {
+    console.error('Python worker error:', err.message);
+    failWorker(proc, err);
+  });
+
+  // e.g. EPIPE when writing to a worker that already died
+  proc.stdin.on('error', (err) => {
+    console.error('Python worker stdin error:', err.message);
+  });
+
+  proc.on('close', (code) => {
+    console.error('Python worker exited with code:', code);
+    failWorker(proc, new Error(`Processor exited with code ${code}`));
+  });
+
+  return proc;
+}
+
+function uint32BE(n) {
+  const buf = Buffer.alloc(4);
+  buf.writeUInt32BE(n, 0);
+  return buf;
+}
+
+function failWorker(proc, err) {
+  if (worker === proc) worker = null;
+  const failed = proc.pending;
+  proc.pending = [];
+  failed.forEach((job) => job.reject(err));
+}
+
+function processFrames(frames) {
+  if (!worker) worker = startWorker();
+  const proc = worker;
+  return new Promise((resolve, reject) => {
+    const timer = setTimeout(() => {
+      // A hung or desynced worker would stall every later request, so kill
+      // it; 'close' fails its pending jobs and the next request respawns.
+      console.error('Processing timeout, restarting Python worker');
+      reject(new Error('Processing timeout'));
+      proc.kill();
+    }, PROCESS_TIMEOUT_MS);
+    proc.pending.push({
+      resolve: (message) => { clearTimeout(timer); resolve(message); },
+      reject: (err) => { clearTimeout(timer); reject(err); },
+    });
+    const parts = [uint32BE(frames.length)];
+    frames.forEach((frameBytes) => parts.push(uint32BE(frameBytes.length), frameBytes));
+    proc.stdin.write(Buffer.concat(parts));
+  });
+}
+
 app.post('/process-frame', (req, res) => {
   // TEMPORARY: Read from specific debug image
   const fs = require('fs');
@@ -27,47 +108,43 @@ app.post('/process-frame', (req, res) => {
     return res.status(400).json({ error: 'No frame provided' });
   }
 
-  // Call Python processing script
-  const python = spawn('python3', [path.join(__dirname, 'process_frame.py')]);
-  let result = '';
-  let error = '';
-
-  python.stdout.on('data', (data) => {
-    result += data.toString();
-  });
-
-  python.stderr.on('data', (data) => {
-    error += data.toString();
-    console.error('Python error:', data.toString());
-  });
-
-  // Send frame data to Python
-  python.stdin.write(JSON.stringify({ frame }));
-  python.stdin.end();
-
-  // Handle completion
-  python.on('close', (code) => {
-    if (code === 0 && result) {
+  // Send raw frame bytes to the Python worker
+  processFrames([Buffer.from(frame, 'base64')])
+    .then((result) => {
       try {
-        const parsed = JSON.parse(result);
+        const [parsed] = JSON.parse(result);
         console.log('Result:', parsed.text, 'Confidence:', parsed.confidence);
         res.json(parsed);
       } catch (e) {
         console.error('JSON parse error:', e);
         res.status(500).json({ error: 'Invalid response from processor', text: '', confidence: 0 });
       }
-    } else {
-      console.error('Python process exited with code:', code);
-      res.status(500).json({ error: error || 'Processing failed', text: '', confidence: 0 });
-    }
-  });
+    })
+    .catch((err) => {
+      res.status(500).json({ error: err.message || 'Processing failed', text: '', confidence: 0 });
+    });
+});
 
-  setTimeout(() => {
-    if (python.exitCode === null) {
-      python.kill();
-      res.status(500).json({ error: 'Processing timeout', text: '', confidence: 0 });
-    }
-  }, 60000);
+// Burst of frames (e.g. video ingest): { frames: [base64, ...] }. The worker
+// runs these through EasyOCR's batched path.
+app.post('/process-frames', (req, res) => {
+  const frames = req.body && req.body.frames;
+  if (!Array.isArray(frames) || frames.length === 0) {
+    return res.status(400).json({ error: 'No frames provided' });
+  }
+
+  processFrames(frames.map((frame) => Buffer.from(frame, 'base64')))
+    .then((result) => {
+      try {
+        res.json(JSON.parse(result));
+      } catch (e) {
+        console.error('JSON parse error:', e);
+        res.status(500).json({ error: 'Invalid response from processor' });
+      }
+    })
+    .catch((err) => {
+      res.status(500).json({ error: err.message || 'Processing failed' });
+    });
 });
 
 app.get('/health', (req, res) => {
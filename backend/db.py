@@ -3,13 +3,32 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 from sqlalchemy import (
-    create_engine, Column, Integer, String, Float, DateTime, Text, Boolean
+    create_engine, event, text, Column, Index, Integer, String, Float, DateTime, Text, Boolean
 )
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 SQLITE_URL = "sqlite:///./app.db"
 
 engine = create_engine(SQLITE_URL, connect_args={"check_same_thread": False})
+
+# WAL + synchronous=NORMAL turns each OCR event commit into a log append
+# instead of a double fsync, and lets the list endpoints read while a write
+# is in flight. busy_timeout makes concurrent writers wait instead of failing.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_conn, _conn_record):
+    cur = dbapi_conn.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cur.execute(pragma)
+    cur.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -20,9 +39,11 @@ def aware_now() -> datetime:
 # --- Core Event as produced by OCR / UI form ---
 class Event(Base):
     __tablename__ = "events"
+    # plate lookups and per-plate history in time order share one index
+    __table_args__ = (Index("ix_events_plate_ts", "plate_text", "timestamp"),)
 
     id         = Column(Integer, primary_key=True, index=True)
-    plate_text = Column(String(32), index=True, nullable=False)
+    plate_text = Column(String(32), nullable=False)
     confidence = Column(Float, nullable=True)  # 0..1
     # Use Python default; SQLite doesn't truly enforce timezone, but we keep tzinfo=UTC.
     timestamp  = Column(DateTime(timezone=True), default=aware_now, nullable=False)
@@ -43,9 +64,11 @@ class Permit(Base):
 # --- Timed parking: first-seen tracking for dwell calculation ---
 class TimedStay(Base):
     __tablename__ = "timed_stays"
+    # one stay per plate; backend.main caches stays keyed by plate
+    __table_args__ = (Index("ix_timed_plate", "plate_text", unique=True),)
 
     id         = Column(Integer, primary_key=True)
-    plate_text = Column(String(32), index=True, nullable=False)
+    plate_text = Column(String(32), nullable=False)
     first_seen = Column(DateTime(timezone=True), default=aware_now, nullable=False)
     last_seen  = Column(DateTime(timezone=True), default=aware_now, onupdate=aware_now, nullable=False)
 
@@ -63,3 +86,15 @@ class Violation(Base):
 
 # Create tables on import (no-op if they already exist)
 Base.metadata.create_all(bind=engine)
+
+# create_all skips indexes on tables that already exist, so databases from
+# before ix_timed_plate / ix_events_plate_ts get them here. Duplicate stays
+# would block the unique index; keep the oldest one per plate.
+with engine.begin() as _conn:
+    _conn.execute(text(
+        "DELETE FROM timed_stays WHERE id NOT IN "
+        "(SELECT MIN(id) FROM timed_stays GROUP BY plate_text)"
+    ))
+    for _table in Base.metadata.sorted_tables:
+        for _index in _table.indexes:
+            _index.create(_conn, checkfirst=True)
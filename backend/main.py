@@ -1,12 +1,16 @@
 # backend/main.py
 from fastapi import FastAPI, Depends, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
+from sqlalchemy import insert, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
 from pathlib import Path
 from datetime import datetime, timezone
 from typing import Optional
+import orjson
 
 from .db import SessionLocal, Base, engine, Event, Permit, TimedStay, Violation
 
@@ -16,6 +20,12 @@ try:
 except Exception:
     HAS_VIDEO = False
 
+try:
+    from .ocr import router as ocr_router
+    HAS_OCR = True
+except Exception:
+    HAS_OCR = False
+
 
 # ---------------------------------------------------------------------
 # Helpers
@@ -34,7 +44,7 @@ def as_aware(dt: datetime | None) -> datetime:
 # ---------------------------------------------------------------------
 # FastAPI Setup
 # ---------------------------------------------------------------------
-app = FastAPI(title="Skytation Backend")
+app = FastAPI(title="Skytation Backend", default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -52,6 +62,9 @@ if Path("media").exists():
 if HAS_VIDEO:
     app.include_router(video_router, prefix="/api/video")
 
+if HAS_OCR:
+    app.include_router(ocr_router, prefix="/api")
+
 
 # ---------------------------------------------------------------------
 # Database dependency
@@ -64,6 +77,28 @@ def get_db():
         db.close()
 
 
+# ---------------------------------------------------------------------
+# In-memory lookup caches
+# ---------------------------------------------------------------------
+# Permits change rarely and timed stays are looked up by plate, so both are
+# held in memory and written through on every mutation instead of queried
+# per OCR event. The caches are per-process (run a single worker).
+_PERMIT_CACHE: set[str] = set()
+_TIMED_CACHE: dict[str, tuple[int, datetime]] = {}  # plate -> (stay id, first_seen)
+
+def load_caches(db: Session) -> None:
+    _PERMIT_CACHE.clear()
+    _PERMIT_CACHE.update(plate for (plate,) in db.query(Permit.plate_text))
+
+    _TIMED_CACHE.clear()
+    rows = db.query(TimedStay.id, TimedStay.plate_text, TimedStay.first_seen).order_by(TimedStay.id)
+    for stay_id, plate, first_seen in rows:
+        _TIMED_CACHE.setdefault(plate, (stay_id, as_aware(first_seen)))
+
+with SessionLocal() as _db:
+    load_caches(_db)
+
+
 # ---------------------------------------------------------------------
 # Health
 # ---------------------------------------------------------------------
@@ -91,78 +126,109 @@ TIMED_LIMIT_MIN = 2  # for demo
 # ---------------------------------------------------------------------
 @app.post("/api/ocr_event")
 def ocr_event(body: OCREventIn, db: Session = Depends(get_db)):
+    # One transaction per decision: INSERT ... RETURNING hands back the event
+    # id for the Violation row without a commit, so each event costs a
+    # single fsync.
+    new_stays: dict[str, tuple[int, datetime]] = {}
+    try:
+        response = _decide_ocr_event(body, db, new_stays)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    # publish stays only once committed, so no request sees an uncommitted id
+    for plate, stay in new_stays.items():
+        _TIMED_CACHE.setdefault(plate, stay)
+    return response
+
+
+# Hot-path writes use Core insert()/update(); the ORM unit of work is
+# noticeably slower per row and nothing here needs the mapped objects.
+def _insert_event(db: Session, **values) -> int:
+    return db.execute(insert(Event).values(**values).returning(Event.id)).scalar_one()
+
+def _insert_violation(db: Session, **values) -> None:
+    db.execute(insert(Violation).values(**values))
+
+
+def _decide_ocr_event(body: OCREventIn, db: Session,
+                      new_stays: dict[str, tuple[int, datetime]]) -> dict:
     ts = as_aware(body.timestamp)
     plate = body.plate_text.strip().upper()
 
     # 1. Confidence gate
     if body.confidence < CONF_THRESHOLD:
-        ev = Event(
-            plate_text=plate, confidence=body.confidence, timestamp=ts,
+        ev_id = _insert_event(
+            db, plate_text=plate, confidence=body.confidence, timestamp=ts,
             location=body.location, result="violation", notes="low_confidence"
         )
-        db.add(ev); db.commit()
-        db.add(Violation(event_id=ev.id, plate_text=plate, timestamp=ts,
-                         location=body.location, reason="low_confidence"))
-        db.commit()
+        _insert_violation(db, event_id=ev_id, plate_text=plate, timestamp=ts,
+                          location=body.location, reason="low_confidence")
         return {"result": "violation", "reason": "low_confidence", "msg": "Confidence below threshold"}
 
     # 2. Permit Zone
     if body.location == "permit":
-        match = db.query(Permit).filter(Permit.plate_text == plate).first()
-        if match:
-            ev = Event(
-                plate_text=plate, confidence=body.confidence, timestamp=ts,
+        if plate in _PERMIT_CACHE:
+            _insert_event(
+                db, plate_text=plate, confidence=body.confidence, timestamp=ts,
                 location="permit", result="approved", notes="permit_found"
             )
-            db.add(ev); db.commit()
             return {"result": "approved", "reason": "permit_found", "msg": "Permit approved"}
         else:
-            ev = Event(
-                plate_text=plate, confidence=body.confidence, timestamp=ts,
+            ev_id = _insert_event(
+                db, plate_text=plate, confidence=body.confidence, timestamp=ts,
                 location="permit", result="violation", notes="no_permit"
             )
-            db.add(ev); db.commit()
-            db.add(Violation(event_id=ev.id, plate_text=plate, timestamp=ts,
-                             location="permit", reason="no_permit"))
-            db.commit()
+            _insert_violation(db, event_id=ev_id, plate_text=plate, timestamp=ts,
+                              location="permit", reason="no_permit")
             return {"result": "violation", "reason": "no_permit", "msg": "No matching permit"}
 
     # 3. Timed Zone
-    stay = db.query(TimedStay).filter(TimedStay.plate_text == plate).first()
-
-    if not stay:
-        # new timed entry
-        stay = TimedStay(plate_text=plate, first_seen=ts, last_seen=ts)
-        db.add(stay)
-        db.commit()
-
-        ev = Event(
-            plate_text=plate, confidence=body.confidence, timestamp=ts,
-            location="timed", result="approved", notes="timed_first_seen"
-        )
-        db.add(ev); db.commit()
-        return {
-            "result": "approved",
-            "reason": "timed_first_seen",
-            "msg": f"Started dwell timer for {plate}",
-            "dwell_minutes": 0,
-            "limit_minutes": TIMED_LIMIT_MIN
-        }
+    cached = _TIMED_CACHE.get(plate)
+
+    if cached is None:
+        # new timed entry; a concurrent event for the same plate (e.g. a burst
+        # of frames) may have created it first, so don't trip the unique index
+        stay_id = db.execute(
+            sqlite_insert(TimedStay).values(plate_text=plate, first_seen=ts, last_seen=ts)
+            .on_conflict_do_nothing(index_elements=["plate_text"])
+            .returning(TimedStay.id)
+        ).scalar_one_or_none()
+
+        if stay_id is not None:
+            new_stays[plate] = (stay_id, ts)
+
+            _insert_event(
+                db, plate_text=plate, confidence=body.confidence, timestamp=ts,
+                location="timed", result="approved", notes="timed_first_seen"
+            )
+            return {
+                "result": "approved",
+                "reason": "timed_first_seen",
+                "msg": f"Started dwell timer for {plate}",
+                "dwell_minutes": 0,
+                "limit_minutes": TIMED_LIMIT_MIN
+            }
+
+        # lost the race: continue with the stay the other request created
+        row = db.execute(
+            select(TimedStay.id, TimedStay.first_seen).where(TimedStay.plate_text == plate)
+        ).one()
+        cached = (row.id, as_aware(row.first_seen))
+        new_stays[plate] = cached
 
     # existing entry → compute dwell time
-    dwell = (ts - as_aware(stay.first_seen)).total_seconds() / 60
-    stay.last_seen = ts
-    db.commit()
+    stay_id, first_seen = cached
+    dwell = (ts - first_seen).total_seconds() / 60
+    db.execute(update(TimedStay).where(TimedStay.id == stay_id).values(last_seen=ts))
 
     if dwell > TIMED_LIMIT_MIN:
-        ev = Event(
-            plate_text=plate, confidence=body.confidence, timestamp=ts,
+        ev_id = _insert_event(
+            db, plate_text=plate, confidence=body.confidence, timestamp=ts,
             location="timed", result="violation", notes=f"exceeded_time:{dwell:.1f}m"
         )
-        db.add(ev); db.commit()
-        db.add(Violation(event_id=ev.id, plate_text=plate, timestamp=ts,
-                         location="timed", reason="exceeded_time"))
-        db.commit()
+        _insert_violation(db, event_id=ev_id, plate_text=plate, timestamp=ts,
+                          location="timed", reason="exceeded_time")
         return {
             "result": "violation",
             "reason": "exceeded_time",
@@ -172,11 +238,10 @@ def ocr_event(body: OCREventIn, db: Session = Depends(get_db)):
         }
 
     # still within limit
-    ev = Event(
-        plate_text=plate, confidence=body.confidence, timestamp=ts,
+    _insert_event(
+        db, plate_text=plate, confidence=body.confidence, timestamp=ts,
         location="timed", result="approved", notes=f"timed_ok:{dwell:.1f}m"
     )
-    db.add(ev); db.commit()
     return {
         "result": "approved",
         "reason": "timed_ok",
@@ -204,12 +269,14 @@ def seed_permits(db: Session = Depends(get_db)):
         if not db.query(Permit).filter(Permit.plate_text == p).first():
             db.add(Permit(plate_text=p, permit_type="A"))
     db.commit()
+    _PERMIT_CACHE.update(sample)
     return {"seeded": sample}
 
 @app.post("/api/timed/reset")
 def reset_timed(db: Session = Depends(get_db)):
     db.query(TimedStay).delete()
     db.commit()
+    _TIMED_CACHE.clear()
     return {"ok": True}
 
 @app.get("/api/timed_stays")
@@ -239,9 +306,11 @@ class WSManager:
         self.clients.discard(ws)
 
     async def broadcast(self, payload: dict):
+        # serialize once for every client
+        text = orjson.dumps(payload).decode()
         for ws in list(self.clients):
             try:
-                await ws.send_json(payload)
+                await ws.send_text(text)
             except Exception:
                 self.disconnect(ws)
 
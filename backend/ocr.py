@@ -0,0 +1,36 @@
+# backend/ocr.py
+import importlib.util
+import threading
+from pathlib import Path
+from fastapi import APIRouter, UploadFile
+from starlette.concurrency import run_in_threadpool
+
+# process_frame.py lives with the mobile OCR backend; load it from there so both
+# servers share one implementation.
+PROCESS_FRAME_PATH = (
+    Path(__file__).resolve().parent.parent
+    / "Skytation-OCR" / "LicensePlateOCR-Backend" / "process_frame.py"
+)
+
+_spec = importlib.util.spec_from_file_location("process_frame", PROCESS_FRAME_PATH)
+process_frame = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(process_frame)
+
+# One shared EasyOCR reader: run one frame at a time so concurrent uploads
+# queue up instead of piling onto the GPU.
+_reader_lock = threading.Lock()
+
+def _process_locked(frame_bytes: bytes) -> dict:
+    with _reader_lock:
+        return process_frame.process_license_plate(frame_bytes)
+
+router = APIRouter(tags=["ocr"])
+
+@router.post("/ocr_frame")
+async def ocr_frame(file: UploadFile):
+    """
+    Run plate OCR on a raw JPEG upload (multipart, no base64 wrapping).
+    """
+    frame_bytes = await file.read()
+    # OCR is CPU/GPU bound; keep it off the event loop
+    return await run_in_threadpool(_process_locked, frame_bytes)
@@ -1,5 +1,5 @@
 # backend/video.py
-import threading, time
+import asyncio, logging, os, re, threading, time
 from typing import Optional
 import cv2
 import numpy as np
@@ -8,9 +8,59 @@ from fastapi import APIRouter, Response
 from starlette.responses import StreamingResponse, JSONResponse
 
 router = APIRouter(prefix="/video", tags=["video"])
+log = logging.getLogger(__name__)
 
 DEFAULT_RTSP_URL = None  # None means "no camera yet"
 
+# Hardware decode: on NVIDIA boxes (Jetson or dGPU) with a GStreamer-enabled
+# OpenCV, RTSP H.264 is decoded by nvv4l2decoder instead of FFmpeg on the CPU.
+HAS_NVIDIA = os.path.exists("/dev/nvidia0") or os.path.exists("/etc/nv_tegra_release")
+HAS_GSTREAMER = re.search(r"GStreamer:\s*YES", cv2.getBuildInformation()) is not None
+HW_DECODE = HAS_NVIDIA and HAS_GSTREAMER
+
+# Hardware encode: torchvision's encode_jpeg runs on NVJPEG for CUDA tensors.
+try:
+    import torch
+    from torchvision.io import encode_jpeg as _nvjpeg_encode
+    HAS_NVJPEG = torch.cuda.is_available()
+except Exception:
+    HAS_NVJPEG = False
+
+JPEG_QUALITY = 70
+
+# Preview width; requested from the capture source rather than resized per frame
+PREVIEW_WIDTH = 1280
+
+def _gst_quote(value: str) -> str:
+    # gst-launch syntax: double-quoted, with backslash escapes
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+def _gst_pipeline(url: str) -> str:
+    # nvvidconv scales on the GPU while converting out of NVMM memory. Only the
+    # width is fixed; with square pixels the height follows the source aspect
+    # ratio, matching the resize fallback in _loop.
+    return (
+        f"rtspsrc location={_gst_quote(url)} latency=100 ! rtph264depay ! h264parse ! "
+        "nvv4l2decoder ! nvvidconv ! "
+        f"video/x-raw,format=BGRx,width={PREVIEW_WIDTH},pixel-aspect-ratio=1/1 ! "
+        "videoconvert ! video/x-raw,format=BGR ! appsink drop=true max-buffers=1"
+    )
+
+def _encode_jpeg(frame: np.ndarray) -> Optional[bytes]:
+    global HAS_NVJPEG
+    if HAS_NVJPEG:
+        try:
+            # upload the contiguous BGR frame, then HWC -> RGB CHW on the GPU
+            rgb = torch.from_numpy(frame).cuda().permute(2, 0, 1).flip(0)
+            return _nvjpeg_encode(rgb, quality=JPEG_QUALITY).cpu().numpy().tobytes()
+        except Exception as e:
+            # e.g. torchvision < 0.19 has no CUDA encode_jpeg; don't retry per frame
+            HAS_NVJPEG = False
+            log.warning("NVJPEG encode failed, using CPU JPEG encoder: %s", e)
+    ok, jpg = cv2.imencode(".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), JPEG_QUALITY,
+                                           int(cv2.IMWRITE_JPEG_OPTIMIZE), 0])
+    return jpg.tobytes() if ok else None
+
 class RTSPStreamer:
     def __init__(self, url: Optional[str] = DEFAULT_RTSP_URL):
         self.url = url
@@ -19,6 +69,26 @@ class RTSPStreamer:
         self.lock = threading.Lock()
         self.last_jpeg = None  # bytes
         self.thread = None
+        # Each frame is JPEG-encoded once in the capture thread and fanned out
+        # to one small queue per MJPEG client on the server's event loop.
+        self.loop = None
+        self.subscribers: set[asyncio.Queue] = set()
+
+    def subscribe(self, loop: asyncio.AbstractEventLoop) -> asyncio.Queue:
+        self.loop = loop
+        q = asyncio.Queue(maxsize=2)
+        self.subscribers.add(q)
+        return q
+
+    def unsubscribe(self, q: asyncio.Queue):
+        self.subscribers.discard(q)
+
+    def _publish(self, jpg: bytes):
+        # runs on the event loop; slow clients drop their oldest frame
+        for q in self.subscribers:
+            if q.full():
+                q.get_nowait()
+            q.put_nowait(jpg)
 
     def start(self):
         with self.lock:
@@ -46,8 +116,21 @@ class RTSPStreamer:
             self.start()
 
     def _open(self):
-        self.cap = cv2.VideoCapture(self.url, cv2.CAP_FFMPEG if self.url and self.url.startswith("rtsp") else 0)
+        is_rtsp = bool(self.url and self.url.startswith("rtsp"))
+        if is_rtsp and HW_DECODE:
+            self.cap = cv2.VideoCapture(_gst_pipeline(self.url), cv2.CAP_GSTREAMER)
+            if self.cap.isOpened():
+                return
+            # pipeline elements missing (e.g. dGPU without nvvidconv); use FFmpeg
+            self.cap.release()
+        self.cap = cv2.VideoCapture(self.url, cv2.CAP_FFMPEG if is_rtsp else 0)
         self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        # only ask for a smaller mode; a 640x480 webcam must not be pushed up
+        native_w = self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)
+        native_h = self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)
+        if native_w > PREVIEW_WIDTH and native_h > 0:
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, PREVIEW_WIDTH)
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, round(PREVIEW_WIDTH * native_h / native_w))
 
     def _loop(self):
         try:
@@ -61,14 +144,18 @@ class RTSPStreamer:
                 if not ok:
                     time.sleep(0.05)
                     continue
-                # optionally resize to reduce bandwidth
+                # the size hint above only binds for local cameras; FFmpeg
+                # network streams still arrive at native size
                 h, w = frame.shape[:2]
-                if w > 1280:
-                    frame = cv2.resize(frame, (1280, int(1280*h/w)))
+                if w > PREVIEW_WIDTH:
+                    frame = cv2.resize(frame, (PREVIEW_WIDTH, int(PREVIEW_WIDTH*h/w)))
                 # BGR -> JPEG
-                ok, jpg = cv2.imencode(".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), 80])
-                if ok:
-                    self.last_jpeg = jpg.tobytes()
+                jpg = _encode_jpeg(frame)
+                if jpg:
+                    self.last_jpeg = jpg
+                    loop = self.loop
+                    if loop is not None and not loop.is_closed():
+                        loop.call_soon_threadsafe(self._publish, self.last_jpeg)
         except Exception:
             pass
         finally:
@@ -79,7 +166,13 @@ class RTSPStreamer:
 
 streamer = RTSPStreamer()
 
+# Rendered placeholders keyed by text; the image never changes for a given text
+_PLACEHOLDER_CACHE: dict[str, bytes] = {}
+
 def _placeholder_jpeg(text="RTSP not configured"):
+    cached = _PLACEHOLDER_CACHE.get(text)
+    if cached is not None:
+        return cached
     img = Image.new("RGB", (960, 540), "#202020")
     d = ImageDraw.Draw(img)
     info = [
@@ -93,7 +186,12 @@ def _placeholder_jpeg(text="RTSP not configured"):
         y += 36
     arr = np.array(img)[:, :, ::-1]  # to BGR for cv2
     ok, jpg = cv2.imencode(".jpg", arr, [int(cv2.IMWRITE_JPEG_QUALITY), 80])
-    return jpg.tobytes() if ok else b""
+    if not ok:
+        return b""
+    _PLACEHOLDER_CACHE[text] = jpg.tobytes()
+    return _PLACEHOLDER_CACHE[text]
+
+_placeholder_jpeg()  # prewarm the default
 
 @router.get("/health")
 def video_health():
@@ -110,14 +208,23 @@ def mjpeg_stream():
     Multipart MJPEG stream. Works in <img> src and updates live.
     """
     boundary = "frame"
-    def gen():
+    async def gen():
+        q = streamer.subscribe(asyncio.get_running_loop())
         # ensure started if we have a url
         streamer.start()
-        while True:
+        try:
             frame = streamer.last_jpeg or _placeholder_jpeg()
-            yield (b"--" + boundary.encode() + b"\r\n"
-                   b"Content-Type: image/jpeg\r\n"
-                   b"Content-Length: " + str(len(frame)).encode() + b"\r\n\r\n" +
-                   frame + b"\r\n")
-            time.sleep(0.05)  # ~20 fps
+            while True:
+                if frame:
+                    yield (b"--" + boundary.encode() + b"\r\n"
+                           b"Content-Type: image/jpeg\r\n"
+                           b"Content-Length: " + str(len(frame)).encode() + b"\r\n\r\n" +
+                           frame + b"\r\n")
+                try:
+                    frame = await asyncio.wait_for(q.get(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    # no new frames; only the placeholder is worth resending
+                    frame = None if streamer.last_jpeg else _placeholder_jpeg()
+        finally:
+            streamer.unsubscribe(q)
     return StreamingResponse(gen(), media_type=f"multipart/x-mixed-replace; boundary={boundary}")